@@ -47,4 +47,9 @@ occupancy_incremental_job = occupancy_incremental_graph.to_job(
     executor_def=multiprocess_executor.configured(
         {"max_concurrent": int(os.environ.get("OCCUPANCY_MAX_CONCURRENT", "8"))}
     ),
+    # Lets the QueuedRunCoordinator throttle concurrent occupancy runs via
+    # tag_concurrency_limits (key "job_type", value "occupancy") instead of
+    # an in-process admission gate — excess runs queue and dequeue as slots
+    # free rather than being rejected
+    tags={"job_type": "occupancy"},
 )
@@ -1,5 +1,6 @@
 from dagster import ConfigurableResource
 import boto3
+from botocore.config import Config
 import psycopg2
 from typing import Optional
 import os
@@ -37,6 +38,9 @@ class S3Resource(ConfigurableResource):
             aws_secret_access_key=self.aws_secret_access_key,
             region_name=self.aws_region,
             endpoint_url=os.getenv("S3_ENDPOINT_URL"),
+            # Sized for concurrent transfers (thread-pool downloads and
+            # multipart uploads share one client)
+            config=Config(max_pool_connections=32),
         )
 
 class MLflowResource(ConfigurableResource):
@@ -11,6 +11,7 @@ from backend.schemas import (
 from datetime import datetime
 import json
 import os
+from backend.utils.s3_transfer import S3_TRANSFER_CONFIG
 
 router = APIRouter()
 
@@ -237,7 +238,7 @@ async def get_classifier_results(
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "minioadmin"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin"),
         )
-        s3_client.download_file(s3_bucket, s3_key, local_path)
+        s3_client.download_file(s3_bucket, s3_key, local_path, Config=S3_TRANSFER_CONFIG)
         with open(local_path, "r") as f:
             results = json.load(f)
     else:
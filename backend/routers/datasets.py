@@ -6,6 +6,8 @@ from typing import List, Optional
 from backend.db.session import get_db
 from backend.db.models import Dataset
 from backend.schemas import DatasetCreate, DatasetResponse, DatasetPreviewResponse, BatchInferenceRequest
+from backend.utils.s3_transfer import S3_TRANSFER_CONFIG
+import io
 import os
 
 router = APIRouter()
@@ -68,7 +70,7 @@ async def preview_dataset(
                 aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "minioadmin"),
                 aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin"),
             )
-            s3_client.download_file(s3_bucket, s3_key, local_path)
+            s3_client.download_file(s3_bucket, s3_key, local_path, Config=S3_TRANSFER_CONFIG)
             df = pd.read_parquet(local_path)
         else:
             df = pd.read_parquet(ds.storage_path)
@@ -151,15 +153,17 @@ async def run_model_on_dataset(
         if ds.storage_path.startswith("s3://"):
             import boto3
             parts = ds.storage_path.replace("s3://", "").split("/", 1)
-            local_path = f"/tmp/batch_input_{dataset_id}.parquet"
             s3_client = boto3.client(
                 "s3",
                 endpoint_url=os.getenv("S3_ENDPOINT_URL"),
                 aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "minioadmin"),
                 aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin"),
             )
-            s3_client.download_file(parts[0], parts[1], local_path)
-            df = pd.read_parquet(local_path)
+            # Stream into memory — no /tmp copy to write, re-read and leak
+            buf = io.BytesIO()
+            s3_client.download_fileobj(parts[0], parts[1], buf, Config=S3_TRANSFER_CONFIG)
+            buf.seek(0)
+            df = pd.read_parquet(buf)
         else:
             df = pd.read_parquet(ds.storage_path)
     except Exception as e:
@@ -177,11 +181,11 @@ async def run_model_on_dataset(
     df_out["prediction"] = predictions.tolist() if hasattr(predictions, 'tolist') else list(predictions)
 
     output_name = request.output_name or f"batch_predictions_ds{dataset_id}_dep{deployment.deployment_id}"
-    output_path = f"/tmp/{output_name}.parquet"
-    df_out.to_parquet(output_path, index=False)
+    out_buf = io.BytesIO()
+    df_out.to_parquet(out_buf, index=False, compression="zstd", compression_level=3)
+    out_buf.seek(0)
 
-    # Try uploading to S3
-    storage_path = output_path
+    # Try uploading to S3; the local file is written only if that fails
     try:
         import boto3
         s3_client = boto3.client(
@@ -192,10 +196,13 @@ async def run_model_on_dataset(
         )
         s3_bucket = os.getenv("S3_BUCKET", "tippers-data")
         s3_key = f"predictions/{output_name}.parquet"
-        s3_client.upload_file(output_path, s3_bucket, s3_key)
+        s3_client.upload_fileobj(out_buf, s3_bucket, s3_key, Config=S3_TRANSFER_CONFIG)
         storage_path = f"s3://{s3_bucket}/{s3_key}"
     except Exception:
-        pass  # Fall back to local
+        # Fall back to local storage
+        storage_path = f"/tmp/{output_name}.parquet"
+        with open(storage_path, "wb") as f:
+            f.write(out_buf.getbuffer())
 
     # Register output dataset
     output_ds_id = reg_ds(
@@ -7,6 +7,8 @@ from datetime import datetime
 from backend.db.session import get_db
 from backend.db.models import OccupancyDataset, OccupancySpaceChunk, Dataset
 from backend.schemas import OccupancyDatasetCreate, OccupancyDatasetResponse
+from backend.utils.s3_transfer import S3_TRANSFER_CONFIG
+import io
 import os
 
 router = APIRouter()
@@ -63,8 +65,10 @@ async def create_occupancy_dataset(
 
     tippers_engine = _get_tippers_engine()
 
-    if start_time is None or end_time is None:
-        with tippers_engine.connect() as conn:
+    # All tippers reads share one connection — checking one out per query
+    # added a round trip each for the bounds, subtree and source-space scans
+    with tippers_engine.connect() as conn:
+        if start_time is None or end_time is None:
             row = conn.execute(sa_text("""
                 WITH RECURSIVE subtree AS (
                     SELECT space_id FROM space WHERE space_id = :root_space_id
@@ -77,32 +81,34 @@ async def create_occupancy_dataset(
                 WHERE space_id IN (SELECT space_id FROM subtree)
             """), {"root_space_id": request.root_space_id}).fetchone()
 
-        if not row or row.min_t is None:
+            if not row or row.min_t is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No session data found for space_id={request.root_space_id}"
+                )
+            if start_time is None:
+                start_time = row.min_t
+            if end_time is None:
+                end_time = row.max_t
+
+        # Strip timezone info for consistent arithmetic
+        if start_time.tzinfo is not None:
+            start_time = start_time.replace(tzinfo=None)
+        if end_time.tzinfo is not None:
+            end_time = end_time.replace(tzinfo=None)
+
+        if end_time <= start_time:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"No session data found for space_id={request.root_space_id}"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="end_time must be after start_time"
             )
-        if start_time is None:
-            start_time = row.min_t
-        if end_time is None:
-            end_time = row.max_t
-
-    # Strip timezone info for consistent arithmetic
-    if start_time.tzinfo is not None:
-        start_time = start_time.replace(tzinfo=None)
-    if end_time.tzinfo is not None:
-        end_time = end_time.replace(tzinfo=None)
-
-    if end_time <= start_time:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="end_time must be after start_time"
-        )
 
-    # -------------------------------------------------------------------------
-    # Query the full space subtree from tippers
-    # -------------------------------------------------------------------------
-    with tippers_engine.connect() as conn:
+        # ---------------------------------------------------------------------
+        # One CTE walks the space subtree and joins each space's session
+        # presence/freshness within the window, so the hierarchy, the source
+        # spaces and the per-space latest data point all come from a single
+        # rowset instead of a subtree query plus per-space scans
+        # ---------------------------------------------------------------------
         subtree_rows = conn.execute(sa_text("""
             WITH RECURSIVE subtree AS (
                 SELECT space_id, parent_space_id FROM space WHERE space_id = :root_space_id
@@ -110,35 +116,35 @@ async def create_occupancy_dataset(
                 SELECT s.space_id, s.parent_space_id FROM space s
                 JOIN subtree st ON s.parent_space_id = st.space_id
             )
-            SELECT space_id, parent_space_id FROM subtree
-        """), {"root_space_id": request.root_space_id}).fetchall()
+            SELECT st.space_id, st.parent_space_id, dr.latest_data
+            FROM subtree st
+            LEFT JOIN (
+                SELECT space_id, MAX(end_time) AS latest_data
+                FROM user_ap_trajectory
+                WHERE start_time < :end_time
+                  AND end_time   > :start_time
+                GROUP BY space_id
+            ) dr ON dr.space_id = st.space_id
+        """), {
+            "root_space_id": request.root_space_id,
+            "start_time": start_time,
+            "end_time": end_time,
+        }).fetchall()
 
-    all_space_ids = [r.space_id for r in subtree_rows]
+    # parent_map doubles as the subtree membership index — its keys are
+    # exactly the subtree's space ids, so no separate list/set copies
     parent_map = {r.space_id: r.parent_space_id for r in subtree_rows}
-    all_space_ids_set = set(all_space_ids)
+    all_space_ids_set = parent_map.keys()
 
-    if not all_space_ids:
+    if not parent_map:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Space {request.root_space_id} not found in tippers DB"
         )
 
-    # -------------------------------------------------------------------------
-    # Find source spaces (leaves with WiFi data in the requested time range)
-    # -------------------------------------------------------------------------
-    with tippers_engine.connect() as conn:
-        source_rows = conn.execute(sa_text("""
-            SELECT DISTINCT space_id FROM user_ap_trajectory
-            WHERE space_id = ANY(:space_ids)
-              AND start_time < :end_time
-              AND end_time   > :start_time
-        """), {
-            "space_ids": all_space_ids,
-            "start_time": start_time,
-            "end_time": end_time,
-        }).fetchall()
-
-    source_spaces = {r.space_id for r in source_rows}
+    # Source spaces are exactly the subtree spaces with session data in range
+    source_spaces = {r.space_id for r in subtree_rows if r.latest_data is not None}
+    latest_by_space = {r.space_id: r.latest_data for r in subtree_rows if r.latest_data is not None}
 
     if not source_spaces:
         # Create unified Dataset parent first
@@ -176,12 +182,15 @@ async def create_occupancy_dataset(
     # -------------------------------------------------------------------------
     # Walk hierarchy upward from source spaces to find derived spaces
     # -------------------------------------------------------------------------
+    # Stop each walk at the first ancestor already visited — its ancestors
+    # are in the set too — so shared prefixes are climbed once and the whole
+    # pass is O(V) rather than O(sources x depth)
     derived_spaces = set()
     for space_id in source_spaces:
         current = space_id
         while True:
             parent = parent_map.get(current)
-            if parent is None or parent not in all_space_ids_set:
+            if parent is None or parent not in all_space_ids_set or parent in derived_spaces:
                 break
             derived_spaces.add(parent)
             current = parent
@@ -193,24 +202,10 @@ async def create_occupancy_dataset(
     # Staleness detection — invalidate chunks with stale tippers data
     # -------------------------------------------------------------------------
     if not request.force_overwrite:
+        stale_parents = set()
         for space_id in source_spaces:
-            with tippers_engine.connect() as conn:
-                freshness = conn.execute(sa_text("""
-                    SELECT MAX(end_time) AS latest_data
-                    FROM user_ap_trajectory
-                    WHERE space_id = :sid
-                      AND start_time < :end_time
-                      AND end_time   > :start_time
-                """), {
-                    "sid": space_id,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                }).fetchone()
-
-            if not freshness or freshness.latest_data is None:
-                continue
-
-            latest = freshness.latest_data
+            # Freshness came back with the subtree CTE — no per-space query
+            latest = latest_by_space[space_id]
             if latest.tzinfo is not None:
                 latest = latest.replace(tzinfo=None)
 
@@ -233,33 +228,38 @@ async def create_occupancy_dataset(
             }).fetchall()
 
             if stale_deleted:
-                # Also invalidate derived parents that depended on this source
+                # Collect derived parents that depended on this source; the
+                # walk stops at already-collected ancestors like above
                 current = space_id
                 while True:
                     parent = parent_map.get(current)
-                    if parent is None or parent not in all_space_ids_set:
+                    if parent is None or parent not in all_space_ids_set or parent in stale_parents:
                         break
-                    db.execute(sa_text("""
-                        DELETE FROM occupancy_space_chunks
-                        WHERE space_id = :sid
-                          AND interval_seconds = :interval
-                          AND status = 'COMPLETED'
-                          AND chunk_start < :end_time
-                          AND chunk_end > :start_time
-                    """), {
-                        "sid": parent,
-                        "interval": interval,
-                        "start_time": start_time,
-                        "end_time": end_time,
-                    })
+                    stale_parents.add(parent)
                     current = parent
 
+        # Invalidate all affected parents in one statement
+        if stale_parents:
+            db.execute(sa_text("""
+                DELETE FROM occupancy_space_chunks
+                WHERE space_id = ANY(:sids)
+                  AND interval_seconds = :interval
+                  AND status = 'COMPLETED'
+                  AND chunk_start < :end_time
+                  AND chunk_end > :start_time
+            """), {
+                "sids": list(stale_parents),
+                "interval": interval,
+                "start_time": start_time,
+                "end_time": end_time,
+            })
+
         db.commit()
 
     # -------------------------------------------------------------------------
     # Incremental gap detection (or force overwrite)
     # -------------------------------------------------------------------------
-    pending_count = 0
+    pending_rows = []
 
     for space_id in all_relevant_spaces:
         space_type = 'source' if space_id in source_spaces else 'derived'
@@ -299,22 +299,59 @@ async def create_occupancy_dataset(
             existing_ranges = [(r.chunk_start, r.chunk_end) for r in existing]
             gaps = _compute_gaps(existing_ranges, start_time, end_time)
 
-        # Insert a PENDING row for each gap
-        for gap_start, gap_end in gaps:
-            db.execute(sa_text("""
-                INSERT INTO occupancy_space_chunks
-                    (space_id, interval_seconds, chunk_start, chunk_end, space_type, status)
-                VALUES
-                    (:space_id, :interval, :chunk_start, :chunk_end, :space_type, 'PENDING')
-                ON CONFLICT (space_id, interval_seconds, chunk_start, chunk_end) DO NOTHING
-            """), {
+        # Collect one PENDING row per gap; inserted in a single batch below
+        pending_rows.extend(
+            {
                 "space_id": space_id,
                 "interval": interval,
                 "chunk_start": gap_start,
                 "chunk_end": gap_end,
                 "space_type": space_type,
-            })
-            pending_count += 1
+            }
+            for gap_start, gap_end in gaps
+        )
+
+    # One executemany instead of a round trip per gap row; cold-start
+    # backfills large enough to hurt go through COPY into a temp table,
+    # which skips per-row parse/bind cost entirely
+    if len(pending_rows) > 1000:
+        raw_cursor = db.connection().connection.cursor()
+        raw_cursor.execute("""
+            CREATE TEMP TABLE _pending_chunk_load (
+                space_id INTEGER,
+                interval_seconds INTEGER,
+                chunk_start TIMESTAMP,
+                chunk_end TIMESTAMP,
+                space_type TEXT
+            ) ON COMMIT DROP
+        """)
+        buf = io.StringIO()
+        for row in pending_rows:
+            buf.write(
+                f"{row['space_id']}\t{row['interval']}\t{row['chunk_start']}\t"
+                f"{row['chunk_end']}\t{row['space_type']}\n"
+            )
+        buf.seek(0)
+        raw_cursor.copy_from(
+            buf, "_pending_chunk_load",
+            columns=("space_id", "interval_seconds", "chunk_start", "chunk_end", "space_type"),
+        )
+        db.execute(sa_text("""
+            INSERT INTO occupancy_space_chunks
+                (space_id, interval_seconds, chunk_start, chunk_end, space_type, status)
+            SELECT space_id, interval_seconds, chunk_start, chunk_end, space_type, 'PENDING'
+            FROM _pending_chunk_load
+            ON CONFLICT (space_id, interval_seconds, chunk_start, chunk_end) DO NOTHING
+        """))
+    elif pending_rows:
+        db.execute(sa_text("""
+            INSERT INTO occupancy_space_chunks
+                (space_id, interval_seconds, chunk_start, chunk_end, space_type, status)
+            VALUES
+                (:space_id, :interval, :chunk_start, :chunk_end, :space_type, 'PENDING')
+            ON CONFLICT (space_id, interval_seconds, chunk_start, chunk_end) DO NOTHING
+        """), pending_rows)
+    pending_count = len(pending_rows)
 
     db.commit()
 
@@ -596,7 +633,7 @@ async def get_occupancy_dataset_results(
             if sp.startswith("s3://"):
                 parts = sp.replace("s3://", "").split("/", 1)
                 lp = f"/tmp/space_{view_space_id}_chunk_{len(dfs)}.parquet"
-                s3_client.download_file(parts[0], parts[1], lp)
+                s3_client.download_file(parts[0], parts[1], lp, Config=S3_TRANSFER_CONFIG)
                 dfs.append(pd.read_parquet(lp))
             elif os.path.exists(sp):
                 dfs.append(pd.read_parquet(sp))
@@ -622,7 +659,7 @@ async def get_occupancy_dataset_results(
         if sp.startswith("s3://"):
             parts = sp.replace("s3://", "").split("/", 1)
             local_path = f"/tmp/results_{dataset_id}.parquet"
-            s3_client.download_file(parts[0], parts[1], local_path)
+            s3_client.download_file(parts[0], parts[1], local_path, Config=S3_TRANSFER_CONFIG)
             df = pd.read_parquet(local_path)
         elif os.path.exists(sp):
             df = pd.read_parquet(sp)
@@ -678,13 +715,13 @@ async def retry_occupancy_dataset(
         "end_time": dataset.end_time,
     }).fetchall()
 
-    db.commit()
-
     reset_count = len(reset_result)
     if reset_count == 0:
+        db.commit()
         return {"reset": 0, "resubmitted": False}
 
-    # Mark dataset RUNNING again
+    # Mark dataset RUNNING again — committed together with the chunk reset
+    # so the whole retry is one transaction (and one WAL sync)
     dataset.status = 'RUNNING'
     dataset.error_message = None
     db.commit()
@@ -16,6 +16,7 @@ from backend.schemas import (
 from datetime import datetime
 import json
 import os
+from backend.utils.s3_transfer import S3_TRANSFER_CONFIG
 
 router = APIRouter()
 
@@ -323,7 +324,7 @@ async def get_snorkel_results(
                         aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "minioadmin"),
                         aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin"),
                     )
-                    s3_client.download_file(s3_bucket, s3_key, local_path)
+                    s3_client.download_file(s3_bucket, s3_key, local_path, Config=S3_TRANSFER_CONFIG)
                     df = pd.read_parquet(local_path)
                 else:
                     df = pd.read_parquet(result_path)
@@ -353,7 +354,7 @@ async def get_snorkel_results(
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "minioadmin"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin"),
         )
-        s3_client.download_file(s3_bucket, s3_key, local_path)
+        s3_client.download_file(s3_bucket, s3_key, local_path, Config=S3_TRANSFER_CONFIG)
         with open(local_path, "r") as f:
             results = json.load(f)
     else:
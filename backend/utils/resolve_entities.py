@@ -3,10 +3,11 @@
 Resolves entity IDs from any index type (SQL or derived) by walking the
 dependency chain back to the root SQL index's parquet data.
 """
+import functools
 import os
 import pandas as pd
 import numpy as np
-import boto3
+import pyarrow.parquet as pq
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -15,28 +16,32 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def _get_s3_client():
-    """Create an S3 client from environment variables."""
-    return boto3.client(
-        "s3",
-        endpoint_url=os.getenv("S3_ENDPOINT_URL"),
-        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "minioadmin"),
-        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin"),
+@functools.lru_cache(maxsize=1)
+def _get_s3_filesystem():
+    """pyarrow S3 filesystem mirroring the boto3 client configuration."""
+    from pyarrow import fs as pafs
+    return pafs.S3FileSystem(
+        access_key=os.getenv("AWS_ACCESS_KEY_ID", "minioadmin"),
+        secret_key=os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin"),
+        region=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+        endpoint_override=os.getenv("S3_ENDPOINT_URL"),
     )
 
 
-def _load_parquet_from_path(storage_path: str) -> pd.DataFrame:
-    """Load a parquet file from S3 or local path."""
+def _load_parquet_from_path(storage_path: str, columns: Optional[list] = None) -> pd.DataFrame:
+    """Load a parquet file from S3 or local path.
+
+    S3 paths stream through the pyarrow filesystem (concurrent range GETs
+    per row group, no /tmp copy to write and re-read). Pass columns to
+    decode only what the caller reads.
+    """
     if storage_path.startswith("s3://"):
-        s3_path_parts = storage_path.replace("s3://", "").split("/", 1)
-        s3_bucket = s3_path_parts[0]
-        s3_key = s3_path_parts[1]
-        local_path = f"/tmp/_resolve_{s3_key.replace('/', '_')}"
-        s3_client = _get_s3_client()
-        s3_client.download_file(s3_bucket, s3_key, local_path)
-        return pd.read_parquet(local_path)
-    else:
-        return pd.read_parquet(storage_path)
+        return pq.read_table(
+            storage_path.replace("s3://", "", 1),
+            filesystem=_get_s3_filesystem(),
+            columns=columns,
+        ).to_pandas()
+    return pd.read_parquet(storage_path, columns=columns)
 
 
 def resolve_entity_ids(
@@ -130,7 +135,9 @@ def _resolve_from_snorkel_job(
     if not job_row.result_path:
         raise ValueError(f"Snorkel job {snorkel_job_id} has no result_path")
 
-    df_predictions = _load_parquet_from_path(job_row.result_path)
+    df_predictions = _load_parquet_from_path(
+        job_row.result_path, columns=["sample_id", "probs"]
+    )
 
     # Resolve the root index DataFrame (recursive)
     df_root = resolve_entity_ids(job_row.index_id, session, index_column)
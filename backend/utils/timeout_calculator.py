@@ -1,18 +1,26 @@
 """Utility for calculating dynamic timeouts based on historical chunk completion times."""
 import os
+import time
 from datetime import datetime, timedelta
 from sqlalchemy import text
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 
 class TimeoutCalculator:
-    """Calculate dynamic timeouts for occupancy chunk jobs."""
+    """Calculate dynamic timeouts for occupancy chunk jobs.
+
+    The historical average moves slowly, so results are cached per
+    (interval_seconds, space_type) for a TTL to avoid re-running the stats
+    query on every call.
+    """
 
     def __init__(self):
         self.multiplier = float(os.getenv("CHUNK_TIMEOUT_MULTIPLIER", "2.0"))
         self.min_timeout = int(os.getenv("CHUNK_TIMEOUT_MIN_SECONDS", "900"))
         self.lookback_days = int(os.getenv("CHUNK_TIMEOUT_LOOKBACK_DAYS", "30"))
+        self.cache_ttl = int(os.getenv("CHUNK_TIMEOUT_CACHE_TTL_SECONDS", "300"))
+        self._cache: Dict[Tuple[int, str], Tuple[float, int]] = {}
 
     def calculate_timeout(
         self,
@@ -31,6 +39,10 @@ class TimeoutCalculator:
         Returns:
             Timeout in seconds (average * multiplier, or fallback minimum)
         """
+        cached = self._cache.get((interval_seconds, space_type))
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+
         lookback_cutoff = datetime.utcnow() - timedelta(days=self.lookback_days)
 
         # Query: Calculate average duration from completed chunks
@@ -57,13 +69,14 @@ class TimeoutCalculator:
 
         if avg_duration is None or avg_duration <= 0:
             # No historical data - use minimum fallback
-            return self.min_timeout
-
-        # Apply multiplier and round up (convert Decimal to float first)
-        calculated_timeout = int(float(avg_duration) * self.multiplier)
+            timeout = self.min_timeout
+        else:
+            # Apply multiplier and round up (convert Decimal to float first),
+            # ensuring at least the minimum timeout
+            timeout = max(int(float(avg_duration) * self.multiplier), self.min_timeout)
 
-        # Ensure at least minimum timeout
-        return max(calculated_timeout, self.min_timeout)
+        self._cache[(interval_seconds, space_type)] = (time.monotonic(), timeout)
+        return timeout
 
 
 # Singleton instance